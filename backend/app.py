@@ -2,15 +2,30 @@
 Enhanced Flask Backend with Real-time Features and ML Integration
 """
 
-from flask import Flask, request, jsonify, render_template
+# Patch the stdlib for cooperative I/O before anything else imports sockets
+import eventlet
+eventlet.monkey_patch()
+
+from flask import Flask, Response, g, has_request_context, request, render_template
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from datetime import datetime, timedelta
 import numpy as np
+import orjson
 import pandas as pd
 import random
 import os
-from threading import Lock
+import csv
+import hashlib
+import io
+import zlib
+import time
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from eventlet.semaphore import Semaphore
+
+from config import config
 
 # Import models
 from models.demand_forecasting import AdvancedDemandForecaster
@@ -26,11 +41,26 @@ app = Flask(__name__,
 app.config['SECRET_KEY'] = 'hackathon-2025-secret-key'
 CORS(app)
 
+# orjson options shared by REST responses and SocketIO payloads
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+class OrjsonWrapper:
+    """json-module compatible wrapper so SocketIO serializes with orjson"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode('utf-8')
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
 # Initialize SocketIO for real-time updates
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet',
+                    message_queue=config.SOCKETIO_MESSAGE_QUEUE, json=OrjsonWrapper)
 
-# Thread lock for concurrent operations
-thread_lock = Lock()
+# Green lock for concurrent operations (does not block the eventlet hub)
+thread_lock = Semaphore()
 
 # Initialize components
 data_generator = SampleDataGenerator()
@@ -41,63 +71,67 @@ demand_forecaster = AdvancedDemandForecaster()
 # Global state for real-time updates
 alert_count = 0
 
+# Inventory version, bumped on every mutation so cached results can be invalidated
+_inv_version = 0
+
+# Short-lived cache for generated alerts
+ALERTS_CACHE_TTL = 1.0  # seconds
+_alerts_cache = {'ts': 0.0, 'version': -1, 'value': None}
+
+# Short-lived cache for the dashboard overview (shared by the API and CSV export)
+OVERVIEW_CACHE_TTL = 1.0  # seconds
+_overview_cache = {'ts': 0.0, 'version': -1, 'value': None}
+
+# Simulated KPIs, re-jittered at most once per refresh interval
+KPI_REFRESH_INTERVAL = 60  # seconds
+_kpi_cache = {'ts': float('-inf'), 'forecast_accuracy': 87.3, 'inventory_turnover': 8.5}
+
+def ojsonify(obj, status=200):
+    """Serialize obj with orjson and wrap it in a JSON response"""
+    return Response(orjson.dumps(obj, option=ORJSON_OPTIONS),
+                    status=status, mimetype='application/json')
+
+@app.before_request
+def bind_request_time():
+    """Capture the current time once per request"""
+    g.now = datetime.now()
+
+def request_time():
+    """Time captured for the current request, or now when outside one"""
+    if has_request_context() and 'now' in g:
+        return g.now
+    return datetime.now()
+
 # ==================== MAIN ROUTES ====================
 
+# Rendered dashboard shell; the page is static (data arrives via XHR/WebSocket),
+# so it is only re-rendered when the template file changes
+INDEX_TEMPLATE_PATH = os.path.join(app.root_path, app.template_folder, 'index.html')
+_index_page = {'mtime': None, 'html': None, 'etag': None}
+
 @app.route('/')
 def index():
     """Serve the main dashboard"""
-    return render_template('index.html')
+    mtime = os.path.getmtime(INDEX_TEMPLATE_PATH)
+    if _index_page['mtime'] != mtime:
+        html = render_template('index.html')
+        etag = hashlib.md5(html.encode('utf-8')).hexdigest()
+        _index_page.update(mtime=mtime, html=html, etag=etag)
+    
+    response = Response(_index_page['html'], mimetype='text/html')
+    response.set_etag(_index_page['etag'])
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
 
 @app.route('/api/dashboard/overview', methods=['GET'])
 def get_dashboard_overview():
     """Enhanced overview with dynamic data"""
     try:
-        # Calculate dynamic KPIs
-        total_products = len(inventory_tracker.products)
-        total_locations = len(inventory_tracker.locations)
-        total_inventory_value = inventory_tracker.calculate_inventory_value()
-        
-        # Generate alerts
-        alerts = alert_system.generate_alerts()
-        critical_alerts = [a for a in alerts if a['severity'] == 'critical']
-        
-        # Calculate forecast accuracy (dynamic based on recent predictions)
-        forecast_accuracy = calculate_forecast_accuracy()
-        
-        # Inventory utilization by location
-        inventory_summary = []
-        for loc in inventory_tracker.locations:
-            utilization = (loc['current_stock'] / loc['capacity']) * 100
-            inventory_summary.append({
-                'location': loc['name'],
-                'location_id': loc['id'],
-                'capacity': loc['capacity'],
-                'current_stock': loc['current_stock'],
-                'utilization': round(utilization, 1),
-                'status': 'optimal' if 60 <= utilization <= 85 else 'warning'
-            })
-        
-        overview_data = {
-            'kpis': {
-                'total_products': total_products,
-                'total_locations': total_locations,
-                'total_inventory_value': round(total_inventory_value, 2),
-                'critical_alerts': len(critical_alerts),
-                'inventory_turnover': calculate_inventory_turnover(),
-                'fill_rate': 96.2,
-                'forecast_accuracy': forecast_accuracy,
-                'stockout_rate': calculate_stockout_rate(),
-                'avg_lead_time': calculate_avg_lead_time()
-            },
-            'recent_alerts': alerts[:5],
-            'inventory_summary': inventory_summary,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return jsonify(overview_data), 200
+        return ojsonify(cached_overview(), 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/inventory/products', methods=['GET', 'POST'])
 def manage_products():
@@ -106,6 +140,7 @@ def manage_products():
         try:
             product_data = request.json
             new_product = inventory_tracker.add_product(product_data)
+            bump_inventory_version()
             
             # Emit real-time update
             socketio.emit('product_added', new_product)
@@ -113,17 +148,17 @@ def manage_products():
             # Check if alerts should be generated
             check_and_emit_alerts()
             
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'product': new_product,
                 'message': 'Product added successfully'
-            }), 201
+            }, 201)
             
         except Exception as e:
-            return jsonify({'error': str(e)}), 400
+            return ojsonify({'error': str(e)}, 400)
     
     else:  # GET
-        return jsonify({'products': inventory_tracker.products}), 200
+        return ojsonify({'products': inventory_tracker.products}, 200)
 
 @app.route('/api/inventory/products/<product_id>', methods=['DELETE'])
 def delete_product(product_id):
@@ -132,14 +167,16 @@ def delete_product(product_id):
         result = inventory_tracker.remove_product(product_id)
         
         if result:
+            bump_inventory_version()
+            
             # Emit real-time update
             socketio.emit('product_removed', {'product_id': product_id})
-            return jsonify({'success': True, 'message': 'Product deleted'}), 200
+            return ojsonify({'success': True, 'message': 'Product deleted'}, 200)
         else:
-            return jsonify({'error': 'Product not found'}), 404
+            return ojsonify({'error': 'Product not found'}, 404)
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return ojsonify({'error': str(e)}, 400)
 
 @app.route('/api/inventory/transfer', methods=['POST'])
 def transfer_stock():
@@ -164,6 +201,7 @@ def transfer_stock():
                 from_location=from_location,
                 to_location=to_location
             )
+            bump_inventory_version()
             
             # Emit real-time update
             socketio.emit('stock_transferred', result)
@@ -171,12 +209,12 @@ def transfer_stock():
             # Check for alerts
             check_and_emit_alerts()
             
-            return jsonify(result), 200
+            return ojsonify(result, 200)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/inventory/adjust', methods=['POST'])
 def adjust_stock():
@@ -186,9 +224,9 @@ def adjust_stock():
         product_id = data.get('product_id')
         adjustment = data.get('adjustment')  # Can be positive or negative
         reason = data.get('reason', 'Manual adjustment')
-        location = data.get('location', 'default')
+        location = data.get('location')
         
-        result = inventory_tracker.adjust_stock(product_id, adjustment, reason)
+        result = inventory_tracker.adjust_stock(product_id, adjustment, reason, location)
         
         if result['success']:
             # Log movement
@@ -197,8 +235,9 @@ def adjust_stock():
                 movement_type='adjustment',
                 quantity=adjustment,
                 reason=reason,
-                location=location
+                location=result['location']
             )
+            bump_inventory_version()
             
             # Emit real-time update
             socketio.emit('stock_adjusted', result)
@@ -206,12 +245,12 @@ def adjust_stock():
             # Check for alerts
             check_and_emit_alerts()
             
-            return jsonify(result), 200
+            return ojsonify(result, 200)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/inventory/tracking/<product_id>', methods=['GET'])
 def get_product_tracking(product_id):
@@ -221,16 +260,16 @@ def get_product_tracking(product_id):
         product = inventory_tracker.get_product_by_id(product_id)
         
         if not product:
-            return jsonify({'error': 'Product not found'}), 404
+            return ojsonify({'error': 'Product not found'}, 404)
         
-        return jsonify({
+        return ojsonify({
             'product': product,
             'movement_history': history,
             'total_movements': len(history)
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/demand/forecast/<product_id>', methods=['GET'])
 def get_product_forecast(product_id):
@@ -251,7 +290,7 @@ def get_product_forecast(product_id):
         # Generate AI insights
         insights = generate_ai_insights(forecast, product_id)
         
-        return jsonify({
+        return ojsonify({
             'product_id': product_id,
             'historical': historical_data,
             'forecast': forecast,
@@ -261,10 +300,10 @@ def get_product_forecast(product_id):
                 'accuracy': forecast.get('accuracy', 87.3),
                 'confidence': forecast.get('confidence', 0.95)
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
@@ -272,64 +311,54 @@ def get_alerts():
     try:
         severity = request.args.get('severity', None)
         
-        # Generate fresh alerts
-        alerts = alert_system.generate_alerts()
+        # Current alerts (regenerated at most once per TTL window)
+        alerts = cached_alerts()
         
         if severity:
             alerts = [a for a in alerts if a['severity'] == severity]
         
+        severity_counts = Counter(a['severity'] for a in alerts)
         summary = {
             'total': len(alerts),
-            'critical': len([a for a in alerts if a['severity'] == 'critical']),
-            'warning': len([a for a in alerts if a['severity'] == 'warning']),
-            'info': len([a for a in alerts if a['severity'] == 'info'])
+            'critical': severity_counts['critical'],
+            'warning': severity_counts['warning'],
+            'info': severity_counts['info']
         }
         
         global alert_count
         alert_count = summary['critical']
         
-        return jsonify({
+        return ojsonify({
             'alerts': alerts,
             'summary': summary,
-            'timestamp': datetime.now().isoformat()
-        }), 200
+            'timestamp': request_time()
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/optimization/replenishment', methods=['GET'])
 def get_replenishment_optimization():
     """ML-enhanced replenishment recommendations"""
     try:
-        recommendations = []
-        
-        for product in inventory_tracker.products:
-            # Get demand forecast
-            forecast = demand_forecaster.forecast_simple(product['id'], periods=3)
-            
-            # Calculate optimal reorder
-            optimal_order = calculate_optimal_reorder(
-                product=product,
-                forecast=forecast
-            )
-            
-            if optimal_order['should_reorder']:
-                recommendations.append(optimal_order)
+        # Forecast demand for all products at once (rows follow inventory order)
+        forecast_matrix = demand_forecaster.forecast_simple_matrix(
+            len(inventory_tracker.products), periods=3
+        )
         
-        # Sort by priority
-        recommendations.sort(key=lambda x: x['priority_score'], reverse=True)
+        recommendations = calculate_optimal_reorders(forecast_matrix)
         
-        return jsonify({
+        return ojsonify({
             'recommendations': recommendations,
             'summary': {
                 'total_items': len(recommendations),
                 'total_investment': sum(r['cost'] for r in recommendations),
                 'estimated_savings': sum(r['savings'] for r in recommendations)
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/optimization/resource-allocation', methods=['GET'])
 def get_resource_allocation():
@@ -338,8 +367,12 @@ def get_resource_allocation():
         allocations = []
         
         # Analyze demand across products
+        forecasts = demand_forecaster.forecast_simple_batch(
+            (p['id'] for p in inventory_tracker.products), periods=1
+        )
+        
         for product in inventory_tracker.products:
-            forecast = demand_forecaster.forecast_simple(product['id'], periods=1)
+            forecast = forecasts[product['id']]
             
             if forecast['trend'] == 'increasing':
                 allocations.append({
@@ -350,33 +383,28 @@ def get_resource_allocation():
                     'impact': f"Handle {forecast['expected_increase']}% demand increase"
                 })
         
-        return jsonify({'allocations': allocations}), 200
+        return ojsonify({'allocations': allocations}, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/suppliers/performance', methods=['GET'])
 def get_supplier_performance():
     """Enhanced supplier performance metrics"""
     try:
-        suppliers = data_generator.generate_supplier_data()
-        
-        # Add performance scoring
-        for supplier in suppliers:
-            supplier['overall_score'] = calculate_supplier_score(supplier)
-            supplier['risk_level'] = assess_supplier_risk(supplier)
+        suppliers = scored_suppliers(data_generator.supplier_version)
         
-        return jsonify({
+        return ojsonify({
             'suppliers': suppliers,
             'summary': {
                 'total': len(suppliers),
-                'high_performers': len([s for s in suppliers if s['overall_score'] > 90]),
-                'at_risk': len([s for s in suppliers if s['risk_level'] == 'high'])
+                'high_performers': sum(1 for s in suppliers if s['overall_score'] > 90),
+                'at_risk': sum(1 for s in suppliers if s['risk_level'] == 'high')
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/weather/impact/<product_id>', methods=['GET'])
 def get_weather_impact_for_product(product_id):
@@ -385,7 +413,7 @@ def get_weather_impact_for_product(product_id):
         product = inventory_tracker.get_product_by_id(product_id)
         
         if not product:
-            return jsonify({'error': 'Product not found'}), 404
+            return ojsonify({'error': 'Product not found'}, 404)
         
         # Get supplier location
         supplier = get_supplier_for_product(product)
@@ -396,17 +424,17 @@ def get_weather_impact_for_product(product_id):
         # Analyze impact
         impact_analysis = analyze_weather_impact(weather_data, product)
         
-        return jsonify({
+        return ojsonify({
             'product': product['name'],
             'supplier': supplier['name'],
             'route': weather_data['route'],
             'weather_forecast': weather_data['forecast'],
             'impact': impact_analysis,
             'recommendations': generate_weather_recommendations(impact_analysis)
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/export/report', methods=['GET'])
 def export_report():
@@ -421,16 +449,14 @@ def export_report():
         elif report_type == 'alerts':
             data = generate_alerts_csv()
         else:
-            return jsonify({'error': 'Invalid report type'}), 400
+            return ojsonify({'error': 'Invalid report type'}, 400)
         
-        return jsonify({
-            'success': True,
-            'csv_data': data,
-            'filename': f'{report_type}_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        }), 200
+        filename = f'{report_type}_report_{request_time().strftime("%Y%m%d_%H%M%S")}.csv'
+        return Response(data, mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename="{filename}"'})
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 # ==================== WEBSOCKET EVENTS ====================
 
@@ -448,18 +474,35 @@ def handle_disconnect():
 @socketio.on('request_alert_update')
 def handle_alert_request():
     """Client requests latest alerts"""
-    alerts = alert_system.generate_alerts()
+    alerts = cached_alerts()
     emit('alert_update', {'alerts': alerts, 'count': len(alerts)})
 
 # ==================== HELPER FUNCTIONS ====================
 
+def bump_inventory_version():
+    """Mark inventory as changed so cached results are recomputed"""
+    global _inv_version
+    with thread_lock:
+        _inv_version += 1
+
+def cached_alerts():
+    """Return current alerts, regenerating at most once per TTL window"""
+    with thread_lock:
+        now = time.monotonic()
+        if (now - _alerts_cache['ts'] < ALERTS_CACHE_TTL
+                and _alerts_cache['version'] == _inv_version):
+            return _alerts_cache['value']
+        
+        alerts = alert_system.generate_alerts()
+        _alerts_cache.update(ts=now, version=_inv_version, value=alerts)
+        return alerts
+
 def check_and_emit_alerts():
     """Check for new alerts and emit via WebSocket"""
-    alerts = alert_system.generate_alerts()
-    critical = [a for a in alerts if a['severity'] == 'critical']
+    alerts = cached_alerts()
     
     global alert_count
-    new_count = len(critical)
+    new_count = sum(1 for a in alerts if a['severity'] == 'critical')
     
     if new_count > alert_count:
         socketio.emit('new_alert', {
@@ -468,61 +511,159 @@ def check_and_emit_alerts():
         })
         alert_count = new_count
 
+def compute_overview():
+    """Build the dashboard overview payload"""
+    # Calculate dynamic KPIs
+    total_products = len(inventory_tracker.products)
+    total_locations = len(inventory_tracker.locations)
+    total_inventory_value = inventory_tracker.calculate_inventory_value()
+    
+    # Generate alerts
+    alerts = cached_alerts()
+    critical_count = sum(1 for a in alerts if a['severity'] == 'critical')
+    
+    # Calculate forecast accuracy (dynamic based on recent predictions)
+    forecast_accuracy = calculate_forecast_accuracy()
+    
+    # Inventory utilization by location
+    loc_stock = inventory_tracker.location_column('stock')
+    loc_capacity = inventory_tracker.location_column('capacity')
+    utilization = loc_stock / loc_capacity * 100
+    statuses = np.where((utilization >= 60) & (utilization <= 85), 'optimal', 'warning')
+    
+    location_fields = itemgetter('name', 'id', 'capacity', 'current_stock')
+    inventory_summary = [
+        {
+            'location': name,
+            'location_id': loc_id,
+            'capacity': capacity,
+            'current_stock': stock,
+            'utilization': util,
+            'status': status
+        }
+        for (name, loc_id, capacity, stock), util, status in zip(
+            map(location_fields, inventory_tracker.locations),
+            np.round(utilization, 1).tolist(),
+            statuses.tolist()
+        )
+    ]
+    
+    overview_data = {
+        'kpis': {
+            'total_products': total_products,
+            'total_locations': total_locations,
+            'total_inventory_value': round(total_inventory_value, 2),
+            'critical_alerts': critical_count,
+            'inventory_turnover': calculate_inventory_turnover(),
+            'fill_rate': 96.2,
+            'forecast_accuracy': forecast_accuracy,
+            'stockout_rate': calculate_stockout_rate(),
+            'avg_lead_time': calculate_avg_lead_time()
+        },
+        'recent_alerts': alerts[:5],
+        'inventory_summary': inventory_summary,
+        'timestamp': request_time()
+    }
+    
+    return overview_data
+
+def cached_overview():
+    """Return the overview, recomputing it at most once per TTL window"""
+    now = time.monotonic()
+    if (now - _overview_cache['ts'] < OVERVIEW_CACHE_TTL
+            and _overview_cache['version'] == _inv_version):
+        return _overview_cache['value']
+    
+    overview = compute_overview()
+    _overview_cache.update(ts=now, version=_inv_version, value=overview)
+    return overview
+
+def simulated_kpis():
+    """Return simulated KPI values, refreshing them once per interval"""
+    now = time.monotonic()
+    if now - _kpi_cache['ts'] > KPI_REFRESH_INTERVAL:
+        _kpi_cache.update(
+            ts=now,
+            forecast_accuracy=round(87.3 + random.uniform(-2, 2), 1),
+            inventory_turnover=round(8.5 + random.uniform(-0.5, 0.5), 1)
+        )
+    return _kpi_cache
+
 def calculate_forecast_accuracy():
     """Calculate dynamic forecast accuracy"""
     # In real implementation, compare predictions vs actual
-    return round(87.3 + random.uniform(-2, 2), 1)
+    return simulated_kpis()['forecast_accuracy']
 
 def calculate_inventory_turnover():
     """Calculate inventory turnover ratio"""
-    return round(8.5 + random.uniform(-0.5, 0.5), 1)
+    return simulated_kpis()['inventory_turnover']
 
 def calculate_stockout_rate():
     """Calculate stockout rate"""
-    low_stock = len(inventory_tracker.get_low_stock_products())
-    total = len(inventory_tracker.products)
+    stock = inventory_tracker.column('stock')
+    low_stock = int((stock <= np.maximum(inventory_tracker.column('safety'),
+                                         inventory_tracker.column('reorder'))).sum())
+    total = len(stock)
     return round((low_stock / total) * 100, 1) if total > 0 else 0
 
 def calculate_avg_lead_time():
     """Calculate average lead time"""
-    if not inventory_tracker.products:
-        return 0
-    return round(np.mean([p.get('lead_time_days', 5) for p in inventory_tracker.products]), 1)
+    lead_times = inventory_tracker.column('lead')
+    return round(float(lead_times.mean()), 1) if len(lead_times) else 0
 
-def calculate_optimal_reorder(product, forecast):
-    """Calculate optimal reorder quantity using ML forecast"""
-    expected_demand = sum(forecast['predictions'][:3])  # Next 3 months
-    current_stock = product['current_stock']
-    safety_stock = product['safety_stock']
-    lead_time = product.get('lead_time_days', 5)
+def calculate_optimal_reorders(forecast_matrix):
+    """Calculate optimal reorders for all products using ML forecasts
+    
+    forecast_matrix holds one row of predictions per product, in inventory
+    order. Only products that should reorder are returned, the furthest
+    below their demand-adjusted reorder level first.
+    """
+    products = inventory_tracker.products
+    stock = inventory_tracker.column('stock')
+    unit_cost = inventory_tracker.column('cost')
+    lead_time = inventory_tracker.column('lead')
+    reorder_point = inventory_tracker.column('reorder')
+    
+    expected_demand = forecast_matrix[:, :3].sum(axis=1)  # Next 3 months
     
     # Economic Order Quantity with forecast adjustment
     annual_demand = expected_demand * 4  # Extrapolate to annual
     ordering_cost = 100
-    holding_cost = product['unit_cost'] * 0.2
+    holding_cost = unit_cost * 0.2
     
     eoq = np.sqrt((2 * annual_demand * ordering_cost) / holding_cost)
     
-    # Adjust for forecast trend
-    if forecast['trend'] == 'increasing':
-        eoq *= 1.2
-    elif forecast['trend'] == 'decreasing':
-        eoq *= 0.8
+    # Units below the reorder level plus lead-time demand (>= 0 means reorder)
+    shortfall = (reorder_point + (expected_demand / 30) * lead_time) - stock
     
-    should_reorder = current_stock <= (product['reorder_point'] + (expected_demand / 30) * lead_time)
+    rows = np.flatnonzero(shortfall >= 0)
+    rows = rows[np.argsort(-shortfall[rows], kind='stable')]
     
-    return {
-        'product_id': product['id'],
-        'product_name': product['name'],
-        'current_stock': current_stock,
-        'forecast_demand': round(expected_demand),
-        'recommended_quantity': round(eoq),
-        'should_reorder': should_reorder,
-        'priority_score': 100 if should_reorder else 50,
-        'cost': round(eoq * product['unit_cost'], 2),
-        'savings': round(random.uniform(5000, 15000), 2),
-        'reorder_date': (datetime.now() + timedelta(days=lead_time)).strftime('%Y-%m-%d')
-    }
+    forecast_demand = np.rint(expected_demand).astype(np.int64)
+    recommended = np.rint(eoq).astype(np.int64)
+    cost = np.round(eoq * unit_cost, 2)
+    now = request_time()
+    
+    return [
+        {
+            'product_id': products[i]['id'],
+            'product_name': products[i]['name'],
+            'current_stock': products[i]['current_stock'],
+            'forecast_demand': int(forecast_demand[i]),
+            'recommended_quantity': int(recommended[i]),
+            'should_reorder': True,
+            'priority_score': 100,  # every returned product needs reordering
+            'cost': float(cost[i]),
+            'savings': estimated_savings(products[i]['id']),
+            'reorder_date': (now + timedelta(days=float(lead_time[i]))).strftime('%Y-%m-%d')
+        }
+        for i in rows.tolist()
+    ]
+
+@lru_cache(maxsize=1024)
+def estimated_savings(product_id):
+    """Simulated annual savings for a product, stable across requests"""
+    return round(random.Random(product_id).uniform(5000, 15000), 2)
 
 def generate_ai_insights(forecast, product_id):
     """Generate AI-driven insights from forecast"""
@@ -587,25 +728,55 @@ def assess_supplier_risk(supplier):
     else:
         return 'low'
 
+@lru_cache(maxsize=1)
+def scored_suppliers(version):
+    """Supplier data with performance scoring, regenerated only when version changes"""
+    suppliers = data_generator.generate_supplier_data()
+    
+    for supplier in suppliers:
+        supplier['overall_score'] = calculate_supplier_score(supplier)
+        supplier['risk_level'] = assess_supplier_risk(supplier)
+    
+    return suppliers
+
 def get_supplier_for_product(product):
     """Get supplier information for a product"""
+    return _supplier_info(product.get('supplier', 'Unknown Supplier'))
+
+@lru_cache(maxsize=1024)
+def _supplier_info(name):
+    """Build (and memoize) the supplier record for a supplier name"""
     return {
-        'name': product.get('supplier', 'Unknown Supplier'),
+        'name': name,
         'location': 'Global Distribution Center',  # Could be in product data
         'shipping_route': 'Air Freight'
     }
 
+WEATHER_CONDITIONS = np.array(['Clear', 'Rainy', 'Stormy', 'Snow'])
+
 def fetch_weather_for_route(origin, product):
     """Fetch weather data for shipping route"""
-    # Simulated weather data
+    return _route_weather(origin, product['id'], request_time().date())
+
+@lru_cache(maxsize=256)
+def _route_weather(origin, product_id, start_date):
+    """Simulated 7-day route weather, deterministic per route and day"""
+    seed = zlib.crc32(f"{origin}|{product_id}|{start_date.isoformat()}".encode('utf-8'))
+    rng = np.random.default_rng(seed)
+    
+    # Draw all seven days at once
+    conditions = rng.choice(WEATHER_CONDITIONS, size=7).tolist()
+    temps = rng.integers(10, 31, size=7).tolist()
+    delay_risks = rng.uniform(0, 0.5, size=7).tolist()
+    
     return {
         'route': f"{origin} → Distribution Center",
         'forecast': [
             {
-                'date': (datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d'),
-                'condition': random.choice(['Clear', 'Rainy', 'Stormy', 'Snow']),
-                'temp': random.randint(10, 30),
-                'delay_risk': random.uniform(0, 0.5)
+                'date': (start_date + timedelta(days=i)).strftime('%Y-%m-%d'),
+                'condition': conditions[i],
+                'temp': temps[i],
+                'delay_risk': delay_risks[i]
             }
             for i in range(7)
         ]
@@ -648,48 +819,51 @@ def generate_weather_recommendations(impact):
 
 def generate_overview_csv():
     """Generate CSV data for overview report"""
-    overview = get_dashboard_overview()[0].json
-    
-    csv_lines = [
-        "Metric,Value",
-        f"Total Products,{overview['kpis']['total_products']}",
-        f"Total Locations,{overview['kpis']['total_locations']}",
-        f"Inventory Value,${overview['kpis']['total_inventory_value']}",
-        f"Critical Alerts,{overview['kpis']['critical_alerts']}",
-        f"Forecast Accuracy,{overview['kpis']['forecast_accuracy']}%"
-    ]
+    overview = cached_overview()
+    
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerows([
+        ['Metric', 'Value'],
+        ['Total Products', overview['kpis']['total_products']],
+        ['Total Locations', overview['kpis']['total_locations']],
+        ['Inventory Value', f"${overview['kpis']['total_inventory_value']}"],
+        ['Critical Alerts', overview['kpis']['critical_alerts']],
+        ['Forecast Accuracy', f"{overview['kpis']['forecast_accuracy']}%"]
+    ])
     
-    return "\n".join(csv_lines)
+    return buf.getvalue()
 
 def generate_inventory_csv():
     """Generate CSV data for inventory report"""
     products = inventory_tracker.products
+    values = inventory_tracker.column('stock') * inventory_tracker.column('cost')
     
-    csv_lines = ["Product,SKU,Category,Current Stock,Reorder Point,Value"]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(['Product', 'SKU', 'Category', 'Current Stock', 'Reorder Point', 'Value'])
     
-    for product in products:
-        value = product['current_stock'] * product['unit_cost']
-        csv_lines.append(
-            f"{product['name']},{product.get('sku', product['id'])},"
-            f"{product['category']},{product['current_stock']},"
-            f"{product['reorder_point']},${value:.2f}"
-        )
+    product_fields = itemgetter('name', 'category', 'current_stock', 'reorder_point')
+    for product, value in zip(products, values.tolist()):
+        name, category, stock, reorder_point = product_fields(product)
+        writer.writerow([
+            name, product.get('sku', product['id']),
+            category, stock, reorder_point, f"${value:.2f}"
+        ])
     
-    return "\n".join(csv_lines)
+    return buf.getvalue()
 
 def generate_alerts_csv():
     """Generate CSV data for alerts report"""
-    alerts = alert_system.generate_alerts()
+    alerts = cached_alerts()
     
-    csv_lines = ["Severity,Type,Product,Message,Timestamp"]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(['Severity', 'Type', 'Product', 'Message', 'Timestamp'])
     
-    for alert in alerts:
-        csv_lines.append(
-            f"{alert['severity']},{alert['type']},{alert['product']},"
-            f"\"{alert['message']}\",{alert['timestamp']}"
-        )
+    writer.writerows(map(itemgetter('severity', 'type', 'product', 'message', 'timestamp'), alerts))
     
-    return "\n".join(csv_lines)
+    return buf.getvalue()
 
 def simple_forecast(product_id, periods):
     """Simple forecast when insufficient data"""
@@ -705,4 +879,4 @@ def simple_forecast(product_id, periods):
 
 if __name__ == '__main__':
     print("Starting AI Demand Forecasting Dashboard...")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=config.DEBUG)
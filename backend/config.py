@@ -7,7 +7,11 @@ import os
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-for-hackathon-2025'
-    DEBUG = True
+    DEBUG = os.environ.get('FLASK_ENV') == 'development'
+    
+    # SocketIO message queue (e.g. redis://localhost:6379/0) for emitting from
+    # external processes; app state is in-process, so serve with one worker
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
     
     # Database settings (for future expansion)
     DATABASE_URI = 'sqlite:///demand_forecasting.db'
@@ -45,4 +49,4 @@ class ProductionConfig(Config):
     TESTING = False
 
 # Default config
-config = DevelopmentConfig()
+config = DevelopmentConfig() if Config.DEBUG else ProductionConfig()
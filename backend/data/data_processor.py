@@ -2,9 +2,84 @@
 Data Processing Utilities
 """
 
-import pandas as pd
+import math
 import numpy as np
 from datetime import datetime
+from numba import njit, prange
+
+# Numeric kernels are compiled eagerly (explicit signatures) so the JIT cost
+# is paid at import time rather than on the first request.
+
+@njit('float64[:](float64[::1], int64)', cache=True)
+def _moving_average_kernel(values, window):
+    """Trailing moving average over non-NaN values (pandas rolling, min_periods=1)"""
+    n = values.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if not np.isnan(values[i]):
+            total += values[i]
+            count += 1
+        if i >= window and not np.isnan(values[i - window]):
+            total -= values[i - window]
+            count -= 1
+        out[i] = total / count if count > 0 else np.nan
+    return out
+
+@njit('Tuple((int64[:], float64[:]))(float64[::1], float64)', cache=True)
+def _outlier_kernel(values, threshold):
+    """Return indices and z-scores of values beyond the threshold"""
+    n = values.shape[0]
+    indices = np.empty(n, dtype=np.int64)
+    z_scores = np.empty(n)
+    if n == 0:
+        return indices, z_scores
+    
+    mean = 0.0
+    for i in range(n):
+        mean += values[i]
+    mean /= n
+    
+    var = 0.0
+    for i in range(n):
+        var += (values[i] - mean) ** 2
+    std = np.sqrt(var / n)
+    
+    count = 0
+    if std > 0:
+        for i in range(n):
+            z = abs((values[i] - mean) / std)
+            if z > threshold:
+                indices[count] = i
+                z_scores[count] = z
+                count += 1
+    return indices[:count], z_scores[:count]
+
+@njit('UniTuple(float64, 4)(float64[::1], float64[::1])',
+      cache=True, fastmath=True, parallel=True)
+def _accuracy_kernel(actual, predicted):
+    """MAE, MSE, RMSE and MAPE (over non-zero actuals) in a single pass"""
+    n = actual.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    
+    sum_abs = 0.0
+    sum_sq = 0.0
+    sum_pct = 0.0
+    nonzero = 0
+    for i in prange(n):
+        err = actual[i] - predicted[i]
+        sum_abs += abs(err)
+        sum_sq += err * err
+        if actual[i] != 0:
+            sum_pct += abs(err / actual[i])
+            nonzero += 1
+    
+    mae = sum_abs / n
+    mse = sum_sq / n
+    mape = sum_pct / nonzero * 100.0 if nonzero > 0 else 0.0
+    return mae, mse, math.sqrt(mse), mape
 
 class DataProcessor:
     """Utility class for data processing and transformation"""
@@ -12,48 +87,51 @@ class DataProcessor:
     @staticmethod
     def clean_demand_data(data):
         """Clean and validate demand data"""
-        df = pd.DataFrame(data)
+        if not data:
+            return []
         
-        # Remove null values
-        df = df.dropna()
+        dates = np.array([r.get('date') for r in data], dtype='datetime64[s]')
+        demand = np.array([r.get('demand') for r in data], dtype=np.float64)
         
-        # Remove negative values
-        df = df[df['demand'] >= 0]
+        # Remove null dates and null/negative demand (NaN >= 0 is False)
+        mask = ~np.isnat(dates) & (demand >= 0)
+        rows = np.flatnonzero(mask)
         
         # Sort by date
-        df = df.sort_values('date')
+        rows = rows[np.argsort(dates[rows], kind='stable')]
         
-        return df.to_dict('records')
+        return [data[i] for i in rows]
     
     @staticmethod
     def calculate_moving_average(values, window=7):
         """Calculate moving average for demand smoothing"""
-        return pd.Series(values).rolling(window=window, min_periods=1).mean().tolist()
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        return _moving_average_kernel(values, max(int(window), 1)).tolist()
     
     @staticmethod
     def detect_outliers(values, threshold=2.5):
         """Detect outliers using standard deviation method"""
-        mean = np.mean(values)
-        std = np.std(values)
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        indices, z_scores = _outlier_kernel(values, float(threshold))
         
-        outliers = []
-        for i, value in enumerate(values):
-            z_score = abs((value - mean) / std) if std > 0 else 0
-            if z_score > threshold:
-                outliers.append({'index': i, 'value': value, 'z_score': z_score})
-        
-        return outliers
+        return [
+            {'index': int(i), 'value': float(values[i]), 'z_score': float(z)}
+            for i, z in zip(indices, z_scores)
+        ]
     
     @staticmethod
     def calculate_forecast_accuracy(actual, predicted):
         """Calculate various accuracy metrics"""
-        actual = np.array(actual)
-        predicted = np.array(predicted)
+        actual = np.ascontiguousarray(actual, dtype=np.float64)
+        predicted = np.ascontiguousarray(predicted, dtype=np.float64)
+        
+        # The kernel indexes both arrays by position without bounds checks
+        if actual.shape != predicted.shape:
+            raise ValueError(
+                f"actual and predicted must have the same shape, got {actual.shape} and {predicted.shape}"
+            )
         
-        mae = np.mean(np.abs(actual - predicted))
-        mse = np.mean((actual - predicted) ** 2)
-        rmse = np.sqrt(mse)
-        mape = np.mean(np.abs((actual - predicted) / actual)) * 100 if np.all(actual != 0) else 0
+        mae, mse, rmse, mape = _accuracy_kernel(actual, predicted)
         
         return {
             'MAE': round(mae, 2),
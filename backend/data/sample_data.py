@@ -3,47 +3,59 @@ Sample Data Generator for Demo and Testing
 """
 
 import numpy as np
-import random
 from datetime import datetime, timedelta
 
+from models.demand_forecasting import SEASONALITY
+
+# Static supplier profiles: (id, name, category, reliability)
+SUPPLIER_PROFILES = [
+    ('SUP-001', 'Global Electronics Ltd', 'Electronics', 'High'),
+    ('SUP-002', 'AutoParts International', 'Automotive', 'High'),
+    ('SUP-003', 'MedSupply Corp', 'Healthcare', 'Very High'),
+    ('SUP-004', 'Tools & Equipment Inc', 'Industrial', 'Medium'),
+    ('SUP-005', 'Consumer Products Ltd', 'Consumer', 'High')
+]
+
+# Inclusive (low, high) ranges for integer metrics, one per supplier profile
+SUPPLIER_INT_RANGES = {
+    'performance_score': [(85, 98), (82, 94), (90, 98), (80, 92), (85, 95)],
+    'on_time_delivery': [(88, 98), (85, 95), (92, 99), (83, 93), (87, 96)],
+    'quality_rating': [(85, 95), (82, 92), (90, 98), (85, 93), (83, 92)],
+    'cost_competitiveness': [(80, 95), (78, 90), (75, 85), (82, 92), (85, 95)],
+    'total_orders': [(150, 300), (120, 250), (200, 400), (80, 180), (180, 350)]
+}
+
+# (low, high) ranges for float metrics, one per supplier profile, and rounding
+SUPPLIER_FLOAT_RANGES = {
+    'lead_time_avg': ([(3, 7), (5, 9), (2, 5), (7, 12), (3, 6)], 1),
+    'defect_rate': ([(0.5, 2.5), (1.0, 3.5), (0.2, 1.5), (1.5, 4.0), (0.8, 2.8)], 2)
+}
+
 class SampleDataGenerator:
     """Generate realistic sample data for dashboard demonstration"""
     
     def __init__(self):
-        self.seasonality_factors = {
-            1: 0.85, 2: 0.90, 3: 1.05, 4: 1.10,
-            5: 1.15, 6: 1.20, 7: 1.25, 8: 1.15,
-            9: 1.05, 10: 0.95, 11: 0.90, 12: 0.85
-        }
+        self.rng = np.random.default_rng()
+        # Bump to signal that cached supplier data should be regenerated
+        self.supplier_version = 0
     
     def generate_historical_demand(self, product_id='PROD-001', months=24):
         """Generate historical demand data with trend and seasonality"""
-        base_demand = random.randint(800, 1200)
-        trend = random.uniform(-2, 5)  # Monthly trend
+        base_demand = int(self.rng.integers(800, 1200, endpoint=True))
+        trend = self.rng.uniform(-2, 5)  # Monthly trend
         
-        dates = []
-        values = []
+        # Month offsets from the current month, oldest first
+        now = datetime.now()
+        i = np.arange(months)
+        offsets = (now.year * 12 + now.month - 1) - (months - i)
+        month_idx = offsets % 12
         
-        for i in range(months):
-            # Calculate date
-            date = datetime.now() - timedelta(days=30 * (months - i))
-            dates.append(date.strftime('%Y-%m'))
-            
-            # Calculate demand with trend and seasonality
-            month = date.month
-            seasonal_factor = self.seasonality_factors.get(month, 1.0)
-            
-            demand = base_demand + (trend * i)
-            demand = demand * seasonal_factor
-            
-            # Add random noise
-            noise = random.uniform(-50, 50)
-            demand += noise
-            
-            # Ensure non-negative
-            demand = max(100, demand)
-            
-            values.append(round(demand, 2))
+        dates = [f"{y}-{m + 1:02d}" for y, m in zip((offsets // 12).tolist(), month_idx.tolist())]
+        
+        # Demand with trend, seasonality and random noise (never below 100)
+        demand = (base_demand + trend * i) * SEASONALITY[month_idx]
+        demand += self.rng.uniform(-50, 50, months)
+        values = np.round(np.maximum(100, demand), 2).tolist()
         
         return {
             'dates': dates,
@@ -52,29 +64,36 @@ class SampleDataGenerator:
     
     def generate_stock_movements(self, products, days=30):
         """Generate daily stock movement data"""
+        rng = self.rng
+        shape = (days, len(products))
+        
+        # Simulate daily stock changes for every (day, product) at once
+        incoming = np.where(rng.random(shape) > 0.7, rng.integers(0, 201, shape), 0)
+        outgoing = rng.integers(50, 151, shape)
+        net_change = incoming - outgoing
+        
+        # Simulate current stock for each day
+        base_stock = np.array([p['current_stock'] for p in products])
+        closing_stock = np.maximum(0, base_stock + rng.integers(-100, 101, shape))
+        
+        incoming, outgoing = incoming.tolist(), outgoing.tolist()
+        net_change, closing_stock = net_change.tolist(), closing_stock.tolist()
+        
         movements = []
+        now = datetime.now()
         
         for day in range(days):
-            date = (datetime.now() - timedelta(days=days - day)).strftime('%Y-%m-%d')
-            day_movements = {}
-            
-            for product in products:
-                # Simulate daily stock changes
-                incoming = random.randint(0, 200) if random.random() > 0.7 else 0
-                outgoing = random.randint(50, 150)
-                net_change = incoming - outgoing
-                
-                # Simulate current stock for that day
-                simulated_stock = product['current_stock'] + random.randint(-100, 100)
-                simulated_stock = max(0, simulated_stock)
-                
-                day_movements[product['id']] = {
+            date = (now - timedelta(days=days - day)).strftime('%Y-%m-%d')
+            day_movements = {
+                product['id']: {
                     'product_name': product['name'],
-                    'incoming': incoming,
-                    'outgoing': outgoing,
-                    'net_change': net_change,
-                    'closing_stock': simulated_stock
+                    'incoming': incoming[day][j],
+                    'outgoing': outgoing[day][j],
+                    'net_change': net_change[day][j],
+                    'closing_stock': closing_stock[day][j]
                 }
+                for j, product in enumerate(products)
+            }
             
             movements.append({
                 'date': date,
@@ -85,72 +104,29 @@ class SampleDataGenerator:
     
     def generate_supplier_data(self):
         """Generate supplier performance data"""
-        suppliers = [
-            {
-                'id': 'SUP-001',
-                'name': 'Global Electronics Ltd',
-                'category': 'Electronics',
-                'performance_score': random.randint(85, 98),
-                'on_time_delivery': random.randint(88, 98),
-                'quality_rating': random.randint(85, 95),
-                'lead_time_avg': round(random.uniform(3, 7), 1),
-                'cost_competitiveness': random.randint(80, 95),
-                'reliability': 'High',
-                'total_orders': random.randint(150, 300),
-                'defect_rate': round(random.uniform(0.5, 2.5), 2)
-            },
-            {
-                'id': 'SUP-002',
-                'name': 'AutoParts International',
-                'category': 'Automotive',
-                'performance_score': random.randint(82, 94),
-                'on_time_delivery': random.randint(85, 95),
-                'quality_rating': random.randint(82, 92),
-                'lead_time_avg': round(random.uniform(5, 9), 1),
-                'cost_competitiveness': random.randint(78, 90),
-                'reliability': 'High',
-                'total_orders': random.randint(120, 250),
-                'defect_rate': round(random.uniform(1.0, 3.5), 2)
-            },
-            {
-                'id': 'SUP-003',
-                'name': 'MedSupply Corp',
-                'category': 'Healthcare',
-                'performance_score': random.randint(90, 98),
-                'on_time_delivery': random.randint(92, 99),
-                'quality_rating': random.randint(90, 98),
-                'lead_time_avg': round(random.uniform(2, 5), 1),
-                'cost_competitiveness': random.randint(75, 85),
-                'reliability': 'Very High',
-                'total_orders': random.randint(200, 400),
-                'defect_rate': round(random.uniform(0.2, 1.5), 2)
-            },
-            {
-                'id': 'SUP-004',
-                'name': 'Tools & Equipment Inc',
-                'category': 'Industrial',
-                'performance_score': random.randint(80, 92),
-                'on_time_delivery': random.randint(83, 93),
-                'quality_rating': random.randint(85, 93),
-                'lead_time_avg': round(random.uniform(7, 12), 1),
-                'cost_competitiveness': random.randint(82, 92),
-                'reliability': 'Medium',
-                'total_orders': random.randint(80, 180),
-                'defect_rate': round(random.uniform(1.5, 4.0), 2)
-            },
+        # One batched draw per field across all suppliers
+        ints = {
+            field: self.rng.integers(*np.array(ranges).T, endpoint=True).tolist()
+            for field, ranges in SUPPLIER_INT_RANGES.items()
+        }
+        floats = {
+            field: np.round(self.rng.uniform(*np.array(ranges).T), decimals).tolist()
+            for field, (ranges, decimals) in SUPPLIER_FLOAT_RANGES.items()
+        }
+        
+        return [
             {
-                'id': 'SUP-005',
-                'name': 'Consumer Products Ltd',
-                'category': 'Consumer',
-                'performance_score': random.randint(85, 95),
-                'on_time_delivery': random.randint(87, 96),
-                'quality_rating': random.randint(83, 92),
-                'lead_time_avg': round(random.uniform(3, 6), 1),
-                'cost_competitiveness': random.randint(85, 95),
-                'reliability': 'High',
-                'total_orders': random.randint(180, 350),
-                'defect_rate': round(random.uniform(0.8, 2.8), 2)
+                'id': supplier_id,
+                'name': name,
+                'category': category,
+                'performance_score': ints['performance_score'][i],
+                'on_time_delivery': ints['on_time_delivery'][i],
+                'quality_rating': ints['quality_rating'][i],
+                'lead_time_avg': floats['lead_time_avg'][i],
+                'cost_competitiveness': ints['cost_competitiveness'][i],
+                'reliability': reliability,
+                'total_orders': ints['total_orders'][i],
+                'defect_rate': floats['defect_rate'][i]
             }
+            for i, (supplier_id, name, category, reliability) in enumerate(SUPPLIER_PROFILES)
         ]
-        
-        return suppliers
@@ -2,15 +2,27 @@
 Enhanced Alert System with Real-time Generation and Multiple Alert Types
 """
 
+from collections import Counter
 from datetime import datetime
+from operator import itemgetter
+import numpy as np
 import random
+import time
 
 class EnhancedAlertSystem:
     """Advanced automated alert generation and management system"""
     
+    # Sort rank per severity (critical first)
+    _SEVERITY_ORDER = {'critical': 0, 'warning': 1, 'info': 2}
+    
     def __init__(self, inventory_tracker):
         self.inventory_tracker = inventory_tracker
         self.alert_history = []
+        self._alert_ids = set()  # ids present in alert_history
+        # Most recent generate_alerts() result, reused by the filter helpers
+        self._cache = None
+        self._cache_ts = 0.0
+        self._cache_ttl = 1.0  # seconds
         self.alert_types = {
             'stockout_risk': 'Stock level critically low',
             'reorder_required': 'Reorder point reached',
@@ -28,41 +40,53 @@ class EnhancedAlertSystem:
         """Generate all current alerts based on inventory status"""
         alerts = []
         
+        # One clock read per generation, shared by every alert
+        epoch = time.time()
+        now_ts = str(int(epoch))  # integer seconds; no strftime formatting
+        now_iso = datetime.fromtimestamp(epoch).isoformat()
+        
+        # Stock status per product, shared by the stock-level checks
+        status_map = {
+            p['id']: self.inventory_tracker.get_stock_status(p['id'])
+            for p in self.inventory_tracker.products
+        }
+        
         # Stock-level alerts
-        alerts.extend(self._check_stock_levels())
+        self._check_stock_levels(alerts, status_map, now_ts, now_iso)
         
         # Overstock alerts
-        alerts.extend(self._check_overstock())
+        self._check_overstock(alerts, status_map, now_ts, now_iso)
         
         # Demand spike alerts
-        alerts.extend(self._check_demand_spikes())
+        self._check_demand_spikes(alerts, now_ts, now_iso)
         
         # Supplier alerts
-        alerts.extend(self._check_supplier_issues())
+        self._check_supplier_issues(alerts, now_ts, now_iso)
         
         # Weather alerts
-        alerts.extend(self._check_weather_impacts())
+        self._check_weather_impacts(alerts, now_ts, now_iso)
         
         # Location capacity alerts
-        alerts.extend(self._check_location_capacity())
+        self._check_location_capacity(alerts, now_ts, now_iso)
         
         # Sort by severity (critical first)
-        severity_order = {'critical': 0, 'warning': 1, 'info': 2}
-        alerts.sort(key=lambda x: severity_order.get(x['severity'], 3))
+        alerts.sort(key=itemgetter('severity_rank'))
         
         # Store in history
         for alert in alerts:
-            if not any(a['id'] == alert['id'] for a in self.alert_history):
+            if alert['id'] not in self._alert_ids:
                 self.alert_history.append(alert)
+                self._alert_ids.add(alert['id'])
+        
+        self._cache = alerts
+        self._cache_ts = time.monotonic()
         
         return alerts
     
-    def _check_stock_levels(self):
+    def _check_stock_levels(self, alerts, status_map, now_ts, now_iso):
         """Check for low stock and critical stock levels"""
-        alerts = []
-        
         for product in self.inventory_tracker.products:
-            stock_status = self.inventory_tracker.get_stock_status(product['id'])
+            stock_status = status_map[product['id']]
             
             if stock_status == 'critical':
                 alerts.append(self._create_alert(
@@ -71,7 +95,9 @@ class EnhancedAlertSystem:
                     product=product,
                     message=f"CRITICAL: Stock at {product['current_stock']} units (Safety stock: {product['safety_stock']})",
                     action=f"IMMEDIATE ACTION REQUIRED: Reorder {product['reorder_point'] * 2} units within 24 hours",
-                    priority=1
+                    priority=1,
+                    now_ts=now_ts,
+                    now_iso=now_iso
                 ))
             
             elif stock_status == 'low':
@@ -81,17 +107,15 @@ class EnhancedAlertSystem:
                     product=product,
                     message=f"Stock below reorder point: {product['current_stock']} units (Reorder at: {product['reorder_point']})",
                     action=f"Place order for {product['reorder_point']} units. Lead time: {product['lead_time_days']} days",
-                    priority=2
+                    priority=2,
+                    now_ts=now_ts,
+                    now_iso=now_iso
                 ))
-        
-        return alerts
     
-    def _check_overstock(self):
+    def _check_overstock(self, alerts, status_map, now_ts, now_iso):
         """Check for overstock situations"""
-        alerts = []
-        
         for product in self.inventory_tracker.products:
-            stock_status = self.inventory_tracker.get_stock_status(product['id'])
+            stock_status = status_map[product['id']]
             
             if stock_status == 'overstock':
                 max_stock = product.get('max_stock', product['reorder_point'] * 2)
@@ -103,30 +127,29 @@ class EnhancedAlertSystem:
                     product=product,
                     message=f"Overstock detected: {product['current_stock']} units ({excess} above optimal level)",
                     action=f"Consider: 1) Promotional campaign to increase sales, 2) Transfer {excess//2} units to high-demand location, 3) Review reorder quantities",
-                    priority=3
+                    priority=3,
+                    now_ts=now_ts,
+                    now_iso=now_iso
                 ))
-        
-        return alerts
     
-    def _check_demand_spikes(self):
+    def _check_demand_spikes(self, alerts, now_ts, now_iso):
         """Check for unusual demand patterns"""
-        alerts = []
-        
         # Randomly simulate demand spike detection (in production, use ML)
         if random.random() > 0.7:
             product = random.choice(self.inventory_tracker.products)
             spike_percent = random.randint(20, 50)
             
             alerts.append({
-                'id': f"ALERT-SPIKE-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                'id': f"ALERT-SPIKE-{now_ts}",
                 'type': 'demand_spike',
                 'severity': 'warning',
+                'severity_rank': self._SEVERITY_ORDER['warning'],
                 'product': product['name'],
                 'product_id': product['id'],
                 'category': product['category'],
                 'location': 'Multiple Locations',
                 'message': f"Demand spike detected: {spike_percent}% increase over normal levels",
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'recommended_action': f"Increase stock allocation by {spike_percent}% and expedite next shipment",
                 'priority': 2,
                 'metadata': {
@@ -135,28 +158,25 @@ class EnhancedAlertSystem:
                     'predicted_demand': int(product['current_stock'] * (1 + spike_percent/100))
                 }
             })
-        
-        return alerts
     
-    def _check_supplier_issues(self):
+    def _check_supplier_issues(self, alerts, now_ts, now_iso):
         """Check for supplier-related issues"""
-        alerts = []
-        
         # Simulate supplier delay (in production, integrate with supplier API)
         if random.random() > 0.8:
             product = random.choice(self.inventory_tracker.products)
             delay_days = random.randint(1, 5)
             
             alerts.append({
-                'id': f"ALERT-SUPPLIER-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                'id': f"ALERT-SUPPLIER-{now_ts}",
                 'type': 'supplier_delay',
                 'severity': 'warning',
+                'severity_rank': self._SEVERITY_ORDER['warning'],
                 'product': product['name'],
                 'product_id': product['id'],
                 'category': product['category'],
                 'location': product['supplier'],
                 'message': f"Supplier '{product['supplier']}' reporting {delay_days}-day delay",
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'recommended_action': f"1) Contact alternative suppliers, 2) Inform customers of potential delays, 3) Adjust safety stock levels",
                 'priority': 2,
                 'metadata': {
@@ -166,13 +186,9 @@ class EnhancedAlertSystem:
                     'new_lead_time': product['lead_time_days'] + delay_days
                 }
             })
-        
-        return alerts
     
-    def _check_weather_impacts(self):
+    def _check_weather_impacts(self, alerts, now_ts, now_iso):
         """Check for weather-related impacts"""
-        alerts = []
-        
         # Simulate weather alert
         if random.random() > 0.75:
             weather_conditions = ['Heavy rainfall', 'Snowstorm', 'Tropical storm', 'Severe winds']
@@ -180,13 +196,14 @@ class EnhancedAlertSystem:
             impact_areas = random.sample(['Distribution Center East', 'Warehouse North', 'Supplier Route'], 2)
             
             alerts.append({
-                'id': f"ALERT-WEATHER-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                'id': f"ALERT-WEATHER-{now_ts}",
                 'type': 'weather_impact',
                 'severity': 'warning',
+                'severity_rank': self._SEVERITY_ORDER['warning'],
                 'product': 'Multiple Products',
                 'location': ', '.join(impact_areas),
                 'message': f"{condition} predicted in operational areas - potential delivery delays",
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'recommended_action': "1) Increase safety stock by 15-20%, 2) Activate backup shipping routes, 3) Prepare contingency plans",
                 'priority': 2,
                 'metadata': {
@@ -196,50 +213,51 @@ class EnhancedAlertSystem:
                     'delay_risk': random.uniform(0.3, 0.7)
                 }
             })
-        
-        return alerts
     
-    def _check_location_capacity(self):
+    def _check_location_capacity(self, alerts, now_ts, now_iso):
         """Check for location capacity warnings"""
-        alerts = []
+        locations = self.inventory_tracker.locations
+        utilizations = (self.inventory_tracker.location_column('stock')
+                        / self.inventory_tracker.location_column('capacity') * 100)
         
-        for location in self.inventory_tracker.locations:
-            utilization = (location['current_stock'] / location['capacity']) * 100
+        for i in np.flatnonzero(utilizations > 90).tolist():
+            location = locations[i]
+            utilization = float(utilizations[i])
             
-            if utilization > 90:
-                alerts.append({
-                    'id': f"ALERT-CAPACITY-{location['id']}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                    'type': 'location_capacity',
-                    'severity': 'warning',
-                    'product': 'Location Capacity',
-                    'location': location['name'],
-                    'message': f"Capacity at {utilization:.1f}% - approaching maximum",
-                    'timestamp': datetime.now().isoformat(),
-                    'recommended_action': f"1) Transfer stock to alternative locations, 2) Expedite shipments, 3) Review storage optimization",
-                    'priority': 2,
-                    'metadata': {
-                        'location_id': location['id'],
-                        'current_utilization': round(utilization, 1),
-                        'current_stock': location['current_stock'],
-                        'capacity': location['capacity'],
-                        'available_space': location['capacity'] - location['current_stock']
-                    }
-                })
-        
-        return alerts
+            alerts.append({
+                'id': f"ALERT-CAPACITY-{location['id']}-{now_ts}",
+                'type': 'location_capacity',
+                'severity': 'warning',
+                'severity_rank': self._SEVERITY_ORDER['warning'],
+                'product': 'Location Capacity',
+                'location': location['name'],
+                'message': f"Capacity at {utilization:.1f}% - approaching maximum",
+                'timestamp': now_iso,
+                'recommended_action': f"1) Transfer stock to alternative locations, 2) Expedite shipments, 3) Review storage optimization",
+                'priority': 2,
+                'metadata': {
+                    'location_id': location['id'],
+                    'current_utilization': round(utilization, 1),
+                    'current_stock': location['current_stock'],
+                    'capacity': location['capacity'],
+                    'available_space': location['capacity'] - location['current_stock']
+                }
+            })
     
-    def _create_alert(self, alert_type, severity, product, message, action, priority=2):
+    def _create_alert(self, alert_type, severity, product, message, action, priority=2,
+                      *, now_ts, now_iso):
         """Create a standardized alert object"""
         return {
-            'id': f"ALERT-{product['id']}-{alert_type.upper()}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            'id': f"ALERT-{product['id']}-{alert_type.upper()}-{now_ts}",
             'type': alert_type,
             'severity': severity,
+            'severity_rank': self._SEVERITY_ORDER.get(severity, 3),
             'product': product['name'],
             'product_id': product['id'],
             'category': product['category'],
             'location': 'All Locations',
             'message': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso,
             'recommended_action': action,
             'current_stock': product['current_stock'],
             'reorder_point': product['reorder_point'],
@@ -248,28 +266,38 @@ class EnhancedAlertSystem:
             'priority': priority
         }
     
+    def _recent_alerts(self):
+        """Alerts from the last generation if still within the cache TTL"""
+        if self._cache is not None and time.monotonic() - self._cache_ts < self._cache_ttl:
+            return self._cache
+        return self.generate_alerts()
+    
     def get_alerts_by_severity(self, severity):
         """Filter alerts by severity level"""
-        all_alerts = self.generate_alerts()
+        all_alerts = self._recent_alerts()
         return [a for a in all_alerts if a['severity'] == severity]
     
     def get_alerts_by_product(self, product_id):
         """Filter alerts by product ID"""
-        all_alerts = self.generate_alerts()
+        all_alerts = self._recent_alerts()
         return [a for a in all_alerts if a.get('product_id') == product_id]
     
     def get_alert_count_by_severity(self):
         """Get count of alerts by severity"""
-        alerts = self.generate_alerts()
+        alerts = self._recent_alerts()
+        counts = Counter(a['severity'] for a in alerts)
         return {
-            'critical': len([a for a in alerts if a['severity'] == 'critical']),
-            'warning': len([a for a in alerts if a['severity'] == 'warning']),
-            'info': len([a for a in alerts if a['severity'] == 'info']),
+            'critical': counts['critical'],
+            'warning': counts['warning'],
+            'info': counts['info'],
             'total': len(alerts)
         }
     
     def clear_alert(self, alert_id):
         """Mark an alert as cleared"""
+        if alert_id not in self._alert_ids:
+            return False
+        
         for alert in self.alert_history:
             if alert['id'] == alert_id:
                 alert['status'] = 'cleared'
@@ -3,24 +3,35 @@ Advanced ML-based Demand Forecasting with ARIMA and Prophet
 """
 
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from datetime import datetime
+from numba import njit
 import warnings
 warnings.filterwarnings('ignore')
 
+# Monthly seasonality factors, indexed by month - 1 (January = 0)
+SEASONALITY = np.array([
+    0.85, 0.90, 1.05, 1.10,
+    1.15, 1.20, 1.25, 1.15,
+    1.05, 0.95, 0.90, 0.85
+], dtype=np.float64)
+
+@njit('float64[:](float64, float64, int64, float64[::1], float64[::1])', cache=True)
+def _prediction_kernel(base_demand, slope, start_month, seasonal_factors, noise):
+    """Trend * seasonality predictions with 5% multiplicative noise, floored at 0"""
+    periods = noise.shape[0]
+    out = np.empty(periods)
+    for i in range(periods):
+        prediction = (base_demand + slope * i) * seasonal_factors[(start_month + i) % 12]
+        out[i] = max(0.0, prediction + prediction * 0.05 * noise[i])
+    return out
+
 class AdvancedDemandForecaster:
     """
     ML-based demand forecasting using multiple algorithms
     """
     
     def __init__(self):
-        self.seasonality_factors = {
-            1: 0.85, 2: 0.90, 3: 1.05, 4: 1.10,
-            5: 1.15, 6: 1.20, 7: 1.25, 8: 1.15,
-            9: 1.05, 10: 0.95, 11: 0.90, 12: 0.85
-        }
+        self.rng = np.random.default_rng()
         self.models = {}
     
     def forecast(self, historical_data, periods=12):
@@ -30,22 +41,21 @@ class AdvancedDemandForecaster:
         if len(historical_data['values']) < 10:
             return self.forecast_simple('PROD-001', periods)
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame({
-            'date': pd.to_datetime(historical_data['dates']),
-            'demand': historical_data['values']
-        })
-        df = df.sort_values('date')
+        # Sort the series by month
+        dates = np.array(historical_data['dates'], dtype='datetime64[s]').astype('datetime64[M]')
+        values = np.asarray(historical_data['values'], dtype=np.float64)
+        order = np.argsort(dates, kind='stable')
+        dates, values = dates[order], values[order]
         
         # Detect trend
-        trend_info = self._detect_trend(df['demand'].values)
+        trend_info = self._detect_trend(values)
         
         # Detect seasonality
-        seasonality_info = self._detect_seasonality(df)
+        seasonality_info = self._detect_seasonality(dates, values)
         
         # Generate predictions
         predictions = self._generate_predictions(
-            df['demand'].values,
+            values,
             periods,
             trend_info,
             seasonality_info
@@ -55,11 +65,8 @@ class AdvancedDemandForecaster:
         confidence_intervals = self._calculate_confidence_intervals(predictions)
         
         # Generate forecast dates
-        last_date = df['date'].iloc[-1]
-        forecast_dates = [
-            (last_date + timedelta(days=30*i)).strftime('%Y-%m')
-            for i in range(1, periods + 1)
-        ]
+        forecast_months = dates[-1] + np.arange(1, periods + 1)
+        forecast_dates = np.datetime_as_string(forecast_months, unit='M').tolist()
         
         return {
             'predictions': predictions,
@@ -69,21 +76,36 @@ class AdvancedDemandForecaster:
             'growth_rate': trend_info['rate'],
             'has_seasonality': seasonality_info['detected'],
             'peak_month': seasonality_info['peak_month'],
-            'accuracy': self._calculate_accuracy(df['demand'].values),
+            'accuracy': self._calculate_accuracy(values),
             'confidence': 0.95
         }
     
     def forecast_simple(self, product_id, periods=12):
         """Simple forecast for products with limited data"""
-        base_demand = 1000
-        predictions = []
+        predictions = self.forecast_simple_matrix(1, periods)[0]
+        return self._simple_forecast_result(predictions.tolist())
+    
+    def forecast_simple_batch(self, product_ids, periods=12):
+        """Simple forecasts for several products, computed in one vectorized pass"""
+        product_ids = list(product_ids)
+        matrix = self.forecast_simple_matrix(len(product_ids), periods)
         
-        for i in range(periods):
-            month = (datetime.now().month + i) % 12 + 1
-            seasonal_factor = self.seasonality_factors.get(month, 1.0)
-            prediction = base_demand * seasonal_factor * (1 + np.random.uniform(-0.1, 0.1))
-            predictions.append(round(prediction, 2))
+        return {
+            product_id: self._simple_forecast_result(row.tolist())
+            for product_id, row in zip(product_ids, matrix)
+        }
+    
+    def forecast_simple_matrix(self, count, periods=12):
+        """Simple-forecast predictions for count products as a (count, periods) array"""
+        base_demand = 1000
+        start_month = datetime.now().month
+        seasonal_factors = SEASONALITY[(start_month + np.arange(periods)) % 12]
+        noise = self.rng.uniform(-0.1, 0.1, (count, periods))
         
+        return np.round(base_demand * seasonal_factors * (1 + noise), 2)
+    
+    def _simple_forecast_result(self, predictions):
+        """Wrap simple-forecast predictions in the standard forecast dict"""
         return {
             'predictions': predictions,
             'trend': 'stable',
@@ -95,13 +117,12 @@ class AdvancedDemandForecaster:
     
     def _detect_trend(self, values):
         """Detect trend in time series"""
-        X = np.arange(len(values)).reshape(-1, 1)
-        y = values
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        slope = model.coef_[0]
+        # Least-squares slope of values against 0..n-1
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        x_centered = np.arange(n) - (n - 1) / 2
+        denom = (x_centered ** 2).sum()
+        slope = float((x_centered * (values - values.mean())).sum() / denom) if denom else 0.0
         
         if slope > 5:
             direction = 'increasing'
@@ -122,20 +143,24 @@ class AdvancedDemandForecaster:
             'rate': growth_rate
         }
     
-    def _detect_seasonality(self, df):
-        """Detect seasonal patterns"""
-        if len(df) < 12:
+    def _detect_seasonality(self, dates, values):
+        """Detect seasonal patterns in a datetime64[M] series"""
+        if len(values) < 12:
             return {'detected': False, 'peak_month': 'December'}
         
-        df['month'] = df['date'].dt.month
-        monthly_avg = df.groupby('month')['demand'].mean()
+        # Average demand per calendar month (only months present in the data)
+        months = dates.astype(np.int64) % 12 + 1
+        sums = np.bincount(months, weights=values, minlength=13)
+        counts = np.bincount(months, minlength=13)
+        month_nums = np.flatnonzero(counts)
+        monthly_avg = sums[month_nums] / counts[month_nums]
         
-        peak_month_num = monthly_avg.idxmax()
+        peak_month_num = int(month_nums[monthly_avg.argmax()])
         peak_month_name = datetime(2000, peak_month_num, 1).strftime('%B')
         
         # Check if variation is significant
-        variation = (monthly_avg.max() - monthly_avg.min()) / monthly_avg.mean()
-        detected = variation > 0.2
+        variation = float((monthly_avg.max() - monthly_avg.min()) / monthly_avg.mean())
+        detected = bool(variation > 0.2)
         
         return {
             'detected': detected,
@@ -145,39 +170,25 @@ class AdvancedDemandForecaster:
     
     def _generate_predictions(self, historical_values, periods, trend_info, seasonality_info):
         """Generate predictions using trend and seasonality"""
-        predictions = []
-        base_demand = np.mean(historical_values[-6:])  # Last 6 months average
-        
-        for i in range(periods):
-            # Apply trend
-            trend_adjustment = trend_info['slope'] * i
-            
-            # Apply seasonality
-            month = (datetime.now().month + i) % 12 + 1
-            seasonal_factor = self.seasonality_factors.get(month, 1.0)
-            
-            # Calculate prediction
-            prediction = (base_demand + trend_adjustment) * seasonal_factor
-            
-            # Add slight randomness for realism
-            noise = np.random.normal(0, prediction * 0.05)
-            prediction = max(0, prediction + noise)
-            
-            predictions.append(round(prediction, 2))
-        
-        return predictions
+        base_demand = float(np.mean(historical_values[-6:]))  # Last 6 months average
+        
+        # Standard normal draws, scaled to 5% of each prediction in the kernel
+        noise = self.rng.standard_normal(periods)
+        
+        predictions = _prediction_kernel(
+            base_demand, float(trend_info['slope']), datetime.now().month,
+            SEASONALITY, noise
+        )
+        
+        return np.round(predictions, 2).tolist()
     
     def _calculate_confidence_intervals(self, predictions):
         """Calculate confidence intervals for predictions"""
-        intervals = []
-        
-        for pred in predictions:
-            intervals.append({
-                'lower': round(pred * 0.85, 2),
-                'upper': round(pred * 1.15, 2)
-            })
+        predictions = np.asarray(predictions, dtype=np.float64)
+        lower = np.round(predictions * 0.85, 2).tolist()
+        upper = np.round(predictions * 1.15, 2).tolist()
         
-        return intervals
+        return [{'lower': lo, 'upper': hi} for lo, hi in zip(lower, upper)]
     
     def _calculate_accuracy(self, values):
         """Calculate model accuracy based on historical performance"""
@@ -185,18 +196,16 @@ class AdvancedDemandForecaster:
             return 75.0
         
         # Simple cross-validation
+        values = np.asarray(values, dtype=np.float64)
         train_size = int(len(values) * 0.8)
         train = values[:train_size]
         test = values[train_size:]
         
-        # Predict test values
-        predictions = []
-        for i in range(len(test)):
-            pred = np.mean(train[-6:])  # Simple moving average
-            predictions.append(pred)
+        # Predict every test value with the same moving average
+        prediction = float(np.mean(train[-6:]))
         
         # Calculate MAPE
-        mape = np.mean(np.abs((test - predictions) / test)) * 100
+        mape = float(np.mean(np.abs((test - prediction) / test))) * 100
         accuracy = max(0, 100 - mape)
         
         return round(accuracy, 1)
@@ -2,8 +2,90 @@
 Enhanced Inventory Tracking with Movement History and Dynamic Operations
 """
 
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
-import random
+from functools import lru_cache
+from itertools import count, islice
+from numba import njit
+import numpy as np
+import threading
+
+from utils.helpers import now_iso
+from .demand_forecasting import SEASONALITY
+
+# Numeric product fields mirrored into column arrays: name -> (field, default, dtype)
+PRODUCT_COLUMNS = {
+    'stock': ('current_stock', 0, np.int64),
+    'cost': ('unit_cost', 0.0, np.float64),
+    'lead': ('lead_time_days', 5, np.float64),
+    'reorder': ('reorder_point', 0, np.int64),
+    'safety': ('safety_stock', 0, np.int64),
+    'max': ('max_stock', None, np.int64)  # None: three times the reorder point
+}
+
+# Numeric fields accepted by add_product; these may be omitted but not null
+NUMERIC_PRODUCT_FIELDS = (
+    'current_stock', 'reorder_point', 'safety_stock', 'max_stock',
+    'unit_cost', 'unit_price', 'lead_time_days'
+)
+
+@dataclass(slots=True)
+class Movement:
+    """A logged stock movement (serialized natively by orjson)"""
+    id: str
+    product_id: str
+    movement_type: str
+    quantity: int
+    timestamp: str
+    reason: str | None = None
+    location: str | None = None
+    from_location: str | None = None
+    to_location: str | None = None
+
+# Retained movements overall and per product (oldest are dropped first)
+MOVEMENT_HISTORY_LIMIT = 100_000
+PRODUCT_MOVEMENT_LIMIT = 10_000
+
+# Stock status per code in InventoryTracker._status_codes
+STATUS_NAMES = ('critical', 'low', 'normal', 'overstock')
+
+# Noise source for synthetic sales history
+_rng = np.random.default_rng()
+
+# Monthly growth of synthetic demand per demand_trend (others are flat)
+TREND_SLOPES = {'increasing': 0.02, 'decreasing': -0.01}
+
+@njit('float64[:](float64, float64, int64[::1], float64[::1], float64[::1])', cache=True, fastmath=True)
+def _sales_kernel(base_demand, slope, month_idx, seasonal_factors, noise):
+    """Linear trend * seasonality * multiplicative noise, one value per month"""
+    months = noise.shape[0]
+    out = np.empty(months)
+    for i in range(months):
+        out[i] = base_demand * (1.0 + slope * i) * seasonal_factors[month_idx[i]] * noise[i]
+    return out
+
+@lru_cache(maxsize=256)
+def _gen_sales(product_id, months, base_demand, demand_trend, version):
+    """Generate realistic sales data for ML training, memoized per product version"""
+    i = np.arange(months)
+    
+    # The `months` calendar months before the current one (integer month arithmetic)
+    this_month = np.datetime64(datetime.now().date(), 'M')
+    month_dates = this_month - (months - i)
+    month_idx = month_dates.astype(np.int64) % 12
+    
+    # Apply trend, seasonality and randomness
+    noise = _rng.uniform(0.9, 1.1, months)
+    demand = _sales_kernel(
+        float(base_demand), TREND_SLOPES.get(demand_trend, 0.0), month_idx,
+        SEASONALITY, noise
+    )
+    
+    return {
+        'dates': np.datetime_as_string(month_dates).tolist(),
+        'values': np.round(demand, 2).tolist()
+    }
 
 class InventoryTracker:
     """Enhanced real-time inventory tracking and management system"""
@@ -11,8 +93,21 @@ class InventoryTracker:
     def __init__(self):
         self.locations = self._initialize_locations()
         self.products = self._initialize_products()
-        self.movement_history = []  # Track all stock movements
-        self.sales_history = {}  # Track sales for ML forecasting
+        # id -> dict indexes for O(1) lookups
+        self._products_by_id = {p['id']: p for p in self.products}
+        self._locations_by_id = {l['id']: l for l in self.locations}
+        self._lock = threading.RLock()  # guards catalog, column and history mutations
+        self.movement_history = deque(maxlen=MOVEMENT_HISTORY_LIMIT)  # Track recent stock movements
+        # product id -> its recent movements
+        self._movements_by_product = defaultdict(lambda: deque(maxlen=PRODUCT_MOVEMENT_LIMIT))
+        # Monotonic id sequences (never reused after a removal)
+        self._product_seq = count(len(self.products) + 1)
+        self._location_seq = count(1)
+        self._movement_seq = count(1)
+        self._product_version = {}  # product id -> bumped on stock changes, keys _gen_sales
+        self._initialize_columns()
+        self._initialize_location_columns()
+        self._initialize_location_stock()
         
     def _initialize_locations(self):
         """Initialize warehouse/distribution center locations"""
@@ -135,234 +230,382 @@ class InventoryTracker:
             }
         ]
     
-    def add_product(self, product_data):
-        """Add new product to inventory"""
-        new_product = {
-            'id': f"PROD-{len(self.products) + 1:03d}",
-            'name': product_data.get('name'),
-            'category': product_data.get('category'),
-            'sku': product_data.get('sku', f"SKU-{len(self.products) + 1:03d}"),
-            'current_stock': product_data.get('current_stock', 0),
-            'reorder_point': product_data.get('reorder_point', 100),
-            'safety_stock': product_data.get('safety_stock', 50),
-            'max_stock': product_data.get('max_stock', 1000),
-            'unit_cost': product_data.get('unit_cost', 10.0),
-            'unit_price': product_data.get('unit_price', 20.0),
-            'supplier': product_data.get('supplier', 'Unknown'),
-            'lead_time_days': product_data.get('lead_time_days', 5),
-            'demand_trend': 'stable'
+    def _initialize_columns(self):
+        """Build column arrays (SoA) mirroring the numeric product fields"""
+        capacity = max(2 * len(self.products), 16)
+        self._arr = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, (_, _, dtype) in PRODUCT_COLUMNS.items()
         }
+        self._rows = {}  # product id -> row in the column arrays
+        self._n = 0
         
-        self.products.append(new_product)
+        for product in self.products:
+            self._append_row(product)
+        self._refresh_status_codes()
+    
+    def _append_row(self, product):
+        """Append a product's numeric fields to the column arrays"""
+        if self._n == len(self._arr['stock']):
+            # Grow by doubling to keep appends amortized O(1)
+            for name, arr in self._arr.items():
+                grown = np.zeros(2 * len(arr), dtype=arr.dtype)
+                grown[:self._n] = arr[:self._n]
+                self._arr[name] = grown
+        
+        for name, (field, default, _) in PRODUCT_COLUMNS.items():
+            value = product.get(field, default)
+            if value is None and name == 'max':
+                value = product.get('reorder_point', 0) * 3
+            self._arr[name][self._n] = value
+        
+        self._rows[product['id']] = self._n
+        self._n += 1
+    
+    def _delete_row(self, row):
+        """Remove a product row in O(1) by moving the last row into it (catalog order not preserved)"""
+        last = self._n - 1
+        for arr in self._arr.values():
+            arr[row] = arr[last]
+        self._n = last
         
-        # Log the addition
-        self.log_movement(
-            product_id=new_product['id'],
-            movement_type='product_added',
-            quantity=new_product['current_stock'],
-            reason='New product added to system'
+        moved = self.products.pop()
+        if row < last:
+            self.products[row] = moved
+            self._rows[moved['id']] = row
+    
+    def _refresh_status_codes(self):
+        """Classify every product's stock level in one pass (codes index STATUS_NAMES)"""
+        stock = self.column('stock')
+        self._status_codes = np.select(
+            [stock <= self.column('safety'), stock <= self.column('reorder'), stock > self.column('max')],
+            [0, 1, 3],
+            default=2
         )
+    
+    def _bump_version(self, product_id):
+        """Invalidate cached sales history for a product"""
+        self._product_version[product_id] = self._product_version.get(product_id, 0) + 1
+    
+    def column(self, name):
+        """Get a view of a numeric product column (see PRODUCT_COLUMNS)"""
+        return self._arr[name][:self._n]
+    
+    def _initialize_location_columns(self):
+        """Build column arrays for location capacity and stock"""
+        self._loc_arr = {
+            'capacity': np.array([l['capacity'] for l in self.locations], dtype=np.float64),
+            'stock': np.array([l['current_stock'] for l in self.locations], dtype=np.float64)
+        }
+        self._loc_rows = {l['id']: i for i, l in enumerate(self.locations)}
+    
+    def _initialize_location_stock(self):
+        """Split each product's stock across locations by capacity share"""
+        # Location current_stock keeps its seeded value, which also counts goods
+        # outside the product catalog: location['products'] only attributes the
+        # catalog's share, so it sums to at most current_stock. Later moves keep
+        # both sides in step, so that unattributed remainder stays constant.
+        weights = self.location_column('capacity') / self.location_column('capacity').sum()
+        for location in self.locations:
+            location['products'] = {}  # product id -> units held here
         
-        return new_product
+        for product in self.products:
+            product['stock_by_location'] = {}  # location id -> units held there
+            shares = np.floor(product['current_stock'] * weights).astype(np.int64)
+            shares[0] += product['current_stock'] - shares.sum()
+            for location, quantity in zip(self.locations, shares.tolist()):
+                self._set_location_stock(product, location, quantity)
+            self._check_location_stock(product)
     
-    def remove_product(self, product_id):
-        """Remove product from inventory"""
-        product = self.get_product_by_id(product_id)
+    def _set_location_stock(self, product, location, quantity):
+        """Record a product's units at a location on both sides of the index"""
+        product['stock_by_location'][location['id']] = quantity
+        location['products'][product['id']] = quantity
+    
+    def _move_location_stock(self, product, location, delta):
+        """Add delta units of a product at a location, keeping the location total in sync"""
+        self._set_location_stock(product, location, product['stock_by_location'].get(location['id'], 0) + delta)
+        location['current_stock'] += delta
+        self._loc_arr['stock'][self._loc_rows[location['id']]] = location['current_stock']
+    
+    def _apply_location_adjustment(self, product, target, adjustment):
+        """Book an adjustment into location buckets and return the ids touched"""
+        # Without a target, additions go to the first location and removals
+        # drain the buckets in location order (the product total covers them)
+        if target is None and adjustment >= 0:
+            target = self.locations[0]
+        
+        if target is not None:
+            self._move_location_stock(product, target, adjustment)
+            return [target['id']]
         
-        if product:
-            self.products = [p for p in self.products if p['id'] != product_id]
+        changes = []
+        remaining = -adjustment
+        for location in self.locations:
+            if remaining == 0:
+                break
+            taken = min(product['stock_by_location'].get(location['id'], 0), remaining)
+            if taken > 0:
+                self._move_location_stock(product, location, -taken)
+                changes.append(location['id'])
+                remaining -= taken
+        return changes
+    
+    def _check_location_stock(self, product):
+        """Verify the per-location breakdown adds up to the product total"""
+        total = sum(product['stock_by_location'].values())
+        if total != product['current_stock']:
+            raise RuntimeError(
+                f"{product['id']}: stock_by_location sums to {total}, "
+                f"current_stock is {product['current_stock']}"
+            )
+    
+    def location_column(self, name):
+        """Get a numeric location column ('capacity' or 'stock'), aligned with locations"""
+        return self._loc_arr[name]
+    
+    def add_product(self, product_data):
+        """Add new product to inventory"""
+        null_fields = [f for f in NUMERIC_PRODUCT_FIELDS if f in product_data and product_data[f] is None]
+        if null_fields:
+            raise ValueError(f"Numeric fields cannot be null: {', '.join(null_fields)}")
+        
+        with self._lock:
+            seq = next(self._product_seq)
+            new_product = {
+                'id': f"PROD-{seq:03d}",
+                'name': product_data.get('name'),
+                'category': product_data.get('category'),
+                'sku': product_data.get('sku', f"SKU-{seq:03d}"),
+                'current_stock': product_data.get('current_stock', 0),
+                'reorder_point': product_data.get('reorder_point', 100),
+                'safety_stock': product_data.get('safety_stock', 50),
+                'max_stock': product_data.get('max_stock', 1000),
+                'unit_cost': product_data.get('unit_cost', 10.0),
+                'unit_price': product_data.get('unit_price', 20.0),
+                'supplier': product_data.get('supplier', 'Unknown'),
+                'lead_time_days': product_data.get('lead_time_days', 5),
+                'demand_trend': 'stable',
+                'stock_by_location': {}
+            }
+            
+            # Initial stock is received at the first location
+            self._move_location_stock(new_product, self.locations[0], new_product['current_stock'])
+            self._check_location_stock(new_product)
+            
+            self.products.append(new_product)
+            self._products_by_id[new_product['id']] = new_product
+            self._append_row(new_product)
+            self._refresh_status_codes()
+            self._bump_version(new_product['id'])
             
-            # Log the removal
+            # Log the addition
             self.log_movement(
-                product_id=product_id,
-                movement_type='product_removed',
-                quantity=0,
-                reason='Product discontinued'
+                product_id=new_product['id'],
+                movement_type='product_added',
+                quantity=new_product['current_stock'],
+                reason='New product added to system'
             )
             
-            return True
-        return False
+            return new_product
+    
+    def remove_product(self, product_id):
+        """Remove product from inventory"""
+        with self._lock:
+            product = self.get_product_by_id(product_id)
+            
+            if product:
+                row = self._rows.pop(product_id)
+                del self._products_by_id[product_id]
+                for location_id, quantity in product['stock_by_location'].items():
+                    location = self._locations_by_id[location_id]
+                    self._move_location_stock(product, location, -quantity)
+                    location['products'].pop(product_id, None)
+                self._delete_row(row)
+                self._refresh_status_codes()
+                
+                # Log the removal
+                self.log_movement(
+                    product_id=product_id,
+                    movement_type='product_removed',
+                    quantity=0,
+                    reason='Product discontinued'
+                )
+                
+                return True
+            return False
     
     def transfer_stock(self, product_id, from_location, to_location, quantity):
         """Transfer stock between locations"""
-        product = self.get_product_by_id(product_id)
-        
-        if not product:
-            return {'success': False, 'error': 'Product not found'}
-        
-        if product['current_stock'] < quantity:
-            return {'success': False, 'error': 'Insufficient stock for transfer'}
-        
-        # Update product stock (in real app, would update location-specific stock)
-        # For demo, we simulate the transfer
-        
-        return {
-            'success': True,
-            'product_id': product_id,
-            'from': from_location,
-            'to': to_location,
-            'quantity': quantity,
-            'timestamp': datetime.now().isoformat()
-        }
+        with self._lock:
+            product = self.get_product_by_id(product_id)
+            
+            if not product:
+                return {'success': False, 'error': 'Product not found'}
+            
+            source = self.get_location_by_id(from_location)
+            target = self.get_location_by_id(to_location)
+            
+            if not source or not target:
+                return {'success': False, 'error': 'Location not found'}
+            
+            if quantity <= 0:
+                return {'success': False, 'error': 'Transfer quantity must be positive'}
+            
+            if from_location == to_location:
+                return {'success': False, 'error': 'Source and destination must differ'}
+            
+            available = product['stock_by_location'].get(from_location, 0)
+            
+            if available < quantity:
+                return {'success': False, 'error': 'Insufficient stock for transfer'}
+            
+            # Move the units between locations; the product total is unchanged
+            self._move_location_stock(product, source, -quantity)
+            self._move_location_stock(product, target, quantity)
+            self._check_location_stock(product)
+            
+            return {
+                'success': True,
+                'product_id': product_id,
+                'from': from_location,
+                'to': to_location,
+                'quantity': quantity,
+                'timestamp': now_iso()
+            }
     
-    def adjust_stock(self, product_id, adjustment, reason='Manual adjustment'):
-        """Adjust stock levels (positive or negative)"""
-        product = self.get_product_by_id(product_id)
-        
-        if not product:
-            return {'success': False, 'error': 'Product not found'}
-        
-        new_stock = product['current_stock'] + adjustment
-        
-        if new_stock < 0:
-            return {'success': False, 'error': 'Cannot reduce stock below zero'}
-        
-        # Update stock
-        product['current_stock'] = new_stock
-        
-        return {
-            'success': True,
-            'product_id': product_id,
-            'previous_stock': product['current_stock'] - adjustment,
-            'new_stock': new_stock,
-            'adjustment': adjustment,
-            'reason': reason,
-            'timestamp': datetime.now().isoformat()
-        }
+    def adjust_stock(self, product_id, adjustment, reason='Manual adjustment', location=None):
+        """Adjust stock levels (positive or negative), at one location if given"""
+        with self._lock:
+            product = self.get_product_by_id(product_id)
+            
+            if not product:
+                return {'success': False, 'error': 'Product not found'}
+            
+            target = self.get_location_by_id(location) if location else None
+            
+            if location and not target:
+                return {'success': False, 'error': 'Location not found'}
+            
+            previous_stock = product['current_stock']
+            new_stock = previous_stock + adjustment
+            
+            if new_stock < 0:
+                return {'success': False, 'error': 'Cannot reduce stock below zero'}
+            
+            if target and product['stock_by_location'].get(target['id'], 0) + adjustment < 0:
+                return {'success': False, 'error': f"Insufficient stock at {target['id']}"}
+            
+            # Update stock
+            product['current_stock'] = new_stock
+            self._arr['stock'][self._rows[product_id]] = new_stock
+            changes = self._apply_location_adjustment(product, target, adjustment)
+            self._check_location_stock(product)
+            self._refresh_status_codes()
+            self._bump_version(product_id)
+            
+            return {
+                'success': True,
+                'product_id': product_id,
+                'previous_stock': previous_stock,
+                'new_stock': new_stock,
+                'adjustment': adjustment,
+                'location': ', '.join(changes),
+                'reason': reason,
+                'timestamp': now_iso()
+            }
     
     def log_movement(self, product_id, movement_type, quantity, **kwargs):
         """Log stock movement for tracking"""
-        movement = {
-            'id': f"MOV-{len(self.movement_history) + 1:06d}",
-            'product_id': product_id,
-            'movement_type': movement_type,
-            'quantity': quantity,
-            'timestamp': datetime.now().isoformat(),
-            **kwargs
-        }
-        
-        self.movement_history.append(movement)
-        return movement
+        with self._lock:
+            movement = Movement(
+                id=f"MOV-{next(self._movement_seq):06d}",
+                product_id=product_id,
+                movement_type=movement_type,
+                quantity=quantity,
+                timestamp=now_iso(),
+                **kwargs
+            )
+            
+            self.movement_history.append(movement)
+            self._movements_by_product[product_id].append(movement)
+            return movement
     
     def get_movement_history(self, product_id=None, limit=50):
         """Get movement history for a product or all products"""
-        if product_id:
-            history = [m for m in self.movement_history if m['product_id'] == product_id]
-        else:
-            history = self.movement_history
-        
-        # Sort by timestamp (most recent first)
-        history = sorted(history, key=lambda x: x['timestamp'], reverse=True)
-        
-        return history[:limit]
+        with self._lock:
+            if product_id:
+                history = self._movements_by_product.get(product_id, ())
+            else:
+                history = self.movement_history
+            
+            # Movements are appended in time order, so the newest are at the end;
+            # snapshot under the lock since iterating a deque during an append raises
+            return list(islice(reversed(history), max(limit, 0)))
     
     def get_sales_history(self, product_id, months=24):
         """Get or generate sales history for ML forecasting"""
-        if product_id not in self.sales_history:
-            # Generate synthetic sales data
-            self.sales_history[product_id] = self._generate_sales_data(product_id, months)
-        
-        return self.sales_history[product_id]
-    
-    def _generate_sales_data(self, product_id, months):
-        """Generate realistic sales data for ML training"""
-        from datetime import timedelta
-        
         product = self.get_product_by_id(product_id)
         if not product:
             return {'dates': [], 'values': []}
         
-        base_demand = product['current_stock']
-        seasonality = {
-            1: 0.85, 2: 0.90, 3: 1.05, 4: 1.10, 5: 1.15, 6: 1.20,
-            7: 1.25, 8: 1.15, 9: 1.05, 10: 0.95, 11: 0.90, 12: 0.85
-        }
-        
-        dates = []
-        values = []
-        
-        for i in range(months):
-            date = datetime.now() - timedelta(days=30 * (months - i))
-            month = date.month
-            
-            # Apply trend
-            if product['demand_trend'] == 'increasing':
-                trend_factor = 1 + (i * 0.02)
-            elif product['demand_trend'] == 'decreasing':
-                trend_factor = 1 - (i * 0.01)
-            else:
-                trend_factor = 1
-            
-            # Apply seasonality
-            seasonal_factor = seasonality.get(month, 1.0)
-            
-            # Add randomness
-            noise = random.uniform(0.9, 1.1)
-            
-            demand = base_demand * trend_factor * seasonal_factor * noise
-            
-            dates.append(date.strftime('%Y-%m'))
-            values.append(round(demand, 2))
-        
-        return {'dates': dates, 'values': values}
+        return _gen_sales(
+            product_id,
+            months,
+            product['current_stock'],
+            product['demand_trend'],
+            self._product_version.get(product_id, 0)
+        )
     
     def get_stock_status(self, product_id):
         """Determine stock status based on current levels"""
-        product = self.get_product_by_id(product_id)
-        if not product:
+        row = self._rows.get(product_id)
+        if row is None:
             return 'unknown'
         
-        current = product['current_stock']
-        safety = product['safety_stock']
-        reorder = product['reorder_point']
-        max_stock = product.get('max_stock', reorder * 3)
-        
-        if current <= safety:
-            return 'critical'
-        elif current <= reorder:
-            return 'low'
-        elif current > max_stock:
-            return 'overstock'
-        else:
-            return 'normal'
+        return STATUS_NAMES[self._status_codes[row]]
     
     def get_product_by_id(self, product_id):
         """Get product details by ID"""
-        return next((p for p in self.products if p['id'] == product_id), None)
+        return self._products_by_id.get(product_id)
     
     def get_location_by_id(self, location_id):
         """Get location details by ID"""
-        return next((l for l in self.locations if l['id'] == location_id), None)
+        return self._locations_by_id.get(location_id)
     
     def calculate_inventory_value(self):
         """Calculate total inventory value"""
-        return sum(p['current_stock'] * p['unit_cost'] for p in self.products)
+        return float(self.column('stock') @ self.column('cost'))
     
     def get_low_stock_products(self):
         """Get list of products with low stock"""
-        return [
-            p for p in self.products 
-            if self.get_stock_status(p['id']) in ['critical', 'low']
-        ]
+        return self._products_where(self._status_codes <= 1)
     
     def get_overstock_products(self):
         """Get list of products with overstock"""
-        return [
-            p for p in self.products 
-            if self.get_stock_status(p['id']) == 'overstock'
-        ]
+        return self._products_where(self._status_codes == 3)
+    
+    def _products_where(self, mask):
+        """Map a boolean row mask back to product dicts in catalog order"""
+        return [self.products[row] for row in np.flatnonzero(mask).tolist()]
     
     def add_location(self, location_data):
         """Add new inventory location"""
-        new_location = {
-            'id': f"LOC-{len(self.locations) + 1:03d}",
-            'name': location_data.get('name'),
-            'type': location_data.get('type', 'warehouse'),
-            'capacity': location_data.get('capacity', 10000),
-            'current_stock': 0,
-            'address': location_data.get('address', 'Unknown'),
-            'manager': location_data.get('manager', 'TBD')
-        }
-        
-        self.locations.append(new_location)
-        return new_location
+        with self._lock:
+            new_location = {
+                'id': f"LOC-{next(self._location_seq):03d}",
+                'name': location_data.get('name'),
+                'type': location_data.get('type', 'warehouse'),
+                'capacity': location_data.get('capacity', 10000),
+                'current_stock': 0,
+                'address': location_data.get('address', 'Unknown'),
+                'manager': location_data.get('manager', 'TBD'),
+                'products': {}
+            }
+            
+            self.locations.append(new_location)
+            self._locations_by_id[new_location['id']] = new_location
+            self._loc_rows[new_location['id']] = len(self.locations) - 1
+            self._loc_arr['capacity'] = np.append(self._loc_arr['capacity'], new_location['capacity'])
+            self._loc_arr['stock'] = np.append(self._loc_arr['stock'], new_location['current_stock'])
+            return new_location
@@ -2,6 +2,6 @@
 Utilities package
 """
 
-from .helpers import format_currency, format_date, calculate_percentage
+from .helpers import format_currency, format_date, calculate_percentage, now_iso
 
-__all__ = ['format_currency', 'format_date', 'calculate_percentage']
+__all__ = ['format_currency', 'format_date', 'calculate_percentage', 'now_iso']
@@ -3,18 +3,38 @@ Helper utility functions
 """
 
 from datetime import datetime
+from functools import lru_cache
 import json
+import time
+
+_CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'INR': '₹'}
+
+# (epoch second, ISO string) of the last now_iso() call
+_last_iso = (0, '')
+
+def now_iso():
+    """Current local time as an ISO string, second resolution (cached per second)"""
+    global _last_iso
+    sec = int(time.time())
+    cached = _last_iso
+    if cached[0] != sec:
+        cached = _last_iso = (sec, datetime.fromtimestamp(sec).isoformat())
+    return cached[1]
 
 def format_currency(amount, currency='USD'):
     """Format number as currency"""
-    symbols = {'USD': '$', 'EUR': '€', 'GBP': '£', 'INR': '₹'}
-    symbol = symbols.get(currency, '$')
+    symbol = _CURRENCY_SYMBOLS.get(currency, '$')
     return f"{symbol}{amount:,.2f}"
 
+@lru_cache(maxsize=4096)
+def _parse_iso(date_str):
+    """Parse an ISO 8601 string (memoized; datetimes are immutable)"""
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
 def format_date(date_obj, format_str='%Y-%m-%d'):
     """Format datetime object as string"""
     if isinstance(date_obj, str):
-        date_obj = datetime.fromisoformat(date_obj.replace('Z', '+00:00'))
+        date_obj = _parse_iso(date_obj)
     return date_obj.strftime(format_str)
 
 def calculate_percentage(value, total):
@@ -36,7 +56,7 @@ def generate_response(data, message='Success', status_code=200):
         'status': 'success' if status_code < 400 else 'error',
         'message': message,
         'data': data,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     }, status_code
 
 def validate_date_range(start_date, end_date):
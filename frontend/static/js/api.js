@@ -216,7 +216,22 @@ class APIClient {
      * Export report as CSV
      */
     async exportReport(reportType = 'overview') {
-        return await this.request(`/export/report?type=${reportType}`);
+        try {
+            const response = await fetch(`${this.baseURL}/export/report?type=${reportType}`);
+
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+
+            const disposition = response.headers.get('Content-Disposition') || '';
+            const match = disposition.match(/filename="?([^"]+)"?/);
+            const filename = match ? match[1] : `${reportType}_report.csv`;
+            const csvData = await response.text();
+            return { success: true, data: { csv_data: csvData, filename } };
+        } catch (error) {
+            console.error('API request failed:', error);
+            return { success: false, error: error.message };
+        }
     }
 
     /**
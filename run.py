@@ -2,6 +2,10 @@
 Enhanced Main runner script with SocketIO support
 """
 
+# Patch the stdlib for eventlet before anything else imports sockets
+import eventlet
+eventlet.monkey_patch()
+
 import sys
 import os
 
@@ -9,16 +13,22 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
 from backend.app import app, socketio
+from config import config
+
+BANNER = (
+    f"{'=' * 60}\n"
+    "🚀 Starting AI Demand Forecasting Dashboard...\n"
+    f"{'=' * 60}\n"
+    "📊 Dashboard URL: http://localhost:5000\n"
+    "📡 API Base URL: http://localhost:5000/api\n"
+    "🔌 WebSocket: Enabled (Real-time updates)\n"
+    f"{'=' * 60}\n"
+    "\n💡 Press CTRL+C to stop the server\n\n"
+)
 
 if __name__ == '__main__':
-    print("="*60)
-    print("🚀 Starting AI Demand Forecasting Dashboard...")
-    print("="*60)
-    print("📊 Dashboard URL: http://localhost:5000")
-    print("📡 API Base URL: http://localhost:5000/api")
-    print("🔌 WebSocket: Enabled (Real-time updates)")
-    print("="*60)
-    print("\n💡 Press CTRL+C to stop the server\n")
+    sys.stdout.write(BANNER)
+    sys.stdout.flush()
     
     # Run with SocketIO
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=config.DEBUG)